@@ -9,7 +9,7 @@ import calendar
 import re
 from time import strptime
 from collections import OrderedDict
-from typing import NoReturn, Optional, Union, Sequence
+from typing import NoReturn, Optional, Union, Sequence, List
 
 import pandas as pd
 
@@ -94,6 +94,12 @@ class BibItem(object):
     def label(self) -> str:
         return self.__label
 
+    @property
+    def required_fields(self) -> List[str]:
+        # plain dict lookup, which is equivalent to (but much cheaper than)
+        # masking `DF_BIB_ENTRY_TYPES` with the entry type
+        return _required_fields.get(self.entry_type, [])
+
     def __normalize_fields(self, check_fields: bool = False) -> NoReturn:
         """
         convert month to number if applicable,
@@ -133,10 +139,7 @@ class BibItem(object):
             self.__setattr__(k, v)
 
     def check_required_fields(self) -> NoReturn:
-        required_fields = DF_BIB_ENTRY_TYPES[
-            DF_BIB_ENTRY_TYPES["entry_type"] == self.entry_type
-        ].iloc[0]["required_fields"]
-        for item in required_fields:
+        for item in self.required_fields:
             # "xx|yy" means "xx or yy"
             # "xx+|yy" means "xx and/or yy"
             check_num = sum([rf in self.__fields for rf in re.findall("\\w+", item)])
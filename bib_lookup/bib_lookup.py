@@ -14,6 +14,7 @@ Requirements
 
 import re
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from collections import OrderedDict
 from string import punctuation
@@ -22,7 +23,7 @@ from typing import Union, Optional, Tuple, List, Sequence, Dict, NoReturn
 import requests
 import feedparser
 
-from ._bib import BibItem, DF_BIB_ENTRY_TYPES, BIB_FIELDS
+from ._bib import BibItem, BIB_FIELDS
 from .utils import (
     is_notebook,
     ReprMixin,
@@ -159,6 +160,26 @@ class BibLookup(ReprMixin):
             "ignore_errors": bool,
                 default False,
                 whether to ignore errors
+            "fetch_cache_limit": int,
+                default 1024,
+                maximum number of fetched (raw) lookup results kept in memory,
+                so that looking up the same publication again
+                does not trigger another network request,
+                set 0 to disable.
+                The fetched results are kept when bib items are popped or saved,
+                and are only cleared by `clear_cache`
+                (unless called with `fetched_results=False`)
+            "prefetch_workers": int,
+                default 8,
+                maximum number of concurrent requests
+                when looking up a sequence of DOIs,
+                set 0 or 1 to look them up one after another.
+                arXiv and PubMed lookups are always sent one at a time,
+                as asked by their API terms of use
+            "session": requests.Session,
+                default None,
+                the session used for the network requests,
+                if None, a new session is created
 
         """
         self.align = align.lower()
@@ -222,11 +243,29 @@ class BibLookup(ReprMixin):
 
         self.__header_pattern = "^@(?P<entry_type>\\w+)\\{(?P<label>[^,]+)"
 
+        # pre-compiled versions of the patterns above,
+        # to avoid recompiling (or looking up the `re` cache) on every lookup
+        self.__doi_regex = re.compile(self.__doi_pattern)
+        self.__doi_prefix_regex = re.compile(self.__doi_pattern_prefix)
+        self.__pm_regex = re.compile(self.__pm_pattern)
+        self.__pm_prefix_regex = re.compile(self.__pm_pattern_prefix)
+        self.__arxiv_regex = re.compile(self.__arxiv_pattern)
+        self.__arxiv_prefix_regex = re.compile(self.__arxiv_pattern_prefix)
+        self.__header_regex = re.compile(self.__header_pattern)
+
         self.ignore_errors = kwargs.get("ignore_errors", False)
         self.timeout = kwargs.get("timeout", 6.0)
         self._arxiv2doi = kwargs.get("arxiv2doi", False)
         self.verbose = kwargs.get("verbose", 0)
         self.print_result = kwargs.get("print_result", False)
+        self.fetch_cache_limit = kwargs.get("fetch_cache_limit", 1024)
+        # raw lookup results keyed by (category, simplified identifier),
+        # the oldest entries are evicted first when the limit is reached
+        self.__fetched_results = OrderedDict()
+        self.prefetch_workers = kwargs.get("prefetch_workers", 8)
+        # errors met while prefetching, reused by the sequential lookups
+        # of the same call instead of sending the failed requests again
+        self.__prefetch_errors = {}
         self._ordering = kwargs.get(
             "ordering", ["title", "author", "journal", "booktitle"]
         )
@@ -239,6 +278,10 @@ class BibLookup(ReprMixin):
 
         self.__exceptional_doi_domains = ["cnki"]
 
+        # a shared session, so that connections are reused across lookups,
+        # and custom transport adapters can be mounted on it
+        self.session = kwargs.get("session", None) or requests.Session()
+
     def __call__(
         self,
         identifier: Union[Path, str, Sequence[str]],
@@ -335,35 +378,39 @@ class BibLookup(ReprMixin):
                 ), "label must be a sequence of strings of the same length as identifier"
             else:
                 label = [None] * len(identifier)
-            if print_result:
-                for idx, item in enumerate(identifier):
-                    self(
-                        item,
-                        align,
-                        ignore_fields,
-                        label[idx],
-                        arxiv2doi,
-                        verbose,
-                        print_result,
-                        timeout,
-                        ignore_errors,
-                    )
-                return
-            else:
-                return "\n".join(
-                    self(
-                        item,
-                        align,
-                        ignore_fields,
-                        label[idx],
-                        arxiv2doi,
-                        verbose,
-                        print_result,
-                        timeout,
-                        ignore_errors,
-                    )
-                    for idx, item in enumerate(identifier)
-                ).strip("\n")
+            self._prefetch(identifier, arxiv2doi, timeout)
+            try:
+                if print_result:
+                    for idx, item in enumerate(identifier):
+                        self(
+                            item,
+                            align,
+                            ignore_fields,
+                            label[idx],
+                            arxiv2doi,
+                            verbose,
+                            print_result,
+                            timeout,
+                            ignore_errors,
+                        )
+                    return
+                else:
+                    return "\n".join(
+                        self(
+                            item,
+                            align,
+                            ignore_fields,
+                            label[idx],
+                            arxiv2doi,
+                            verbose,
+                            print_result,
+                            timeout,
+                            ignore_errors,
+                        )
+                        for idx, item in enumerate(identifier)
+                    ).strip("\n")
+            finally:
+                self.__prefetch_errors.clear()
         else:
             raise TypeError(
                 f"identifier must be a string or a sequence of strings, but got {identifier}"
@@ -372,18 +419,7 @@ class BibLookup(ReprMixin):
         category, feed_content, idtf = self._obtain_feed_content(
             identifier, arxiv2doi, timeout
         )
-        if category == "doi":
-            res = self._handle_doi(feed_content)
-        elif category == "pm":
-            res = self._handle_pm(feed_content)
-        elif category == "arxiv":
-            res = self._handle_arxiv(feed_content)
-        elif category == "error" or re.findall(
-            "|".join(self.__exceptional_doi_domains), idtf
-        ):
-            res = self.default_err
-
-        res = self._handle_network_error(res)
+        res = self._fetch(category, feed_content, idtf)
 
         if res not in self.lookup_errors:
             try:
@@ -410,6 +446,120 @@ class BibLookup(ReprMixin):
             return
         return str(res)
 
+    def _fetch(
+        self, category: str, feed_content: dict, idtf: str
+    ) -> Union[str, Dict[str, str]]:
+        """
+        fetch the raw lookup result of a publication,
+        from memory if it has been fetched before, otherwise via the network
+
+        Parameters
+        ----------
+        category: str,
+            one of "doi", "pm", "arxiv", "error"
+        feed_content: dict,
+            feed content to GET or POST
+        idtf: str,
+            simplified identifier of the publication
+
+        Returns
+        -------
+        res: str or dict,
+            the raw lookup result, or one of `self.lookup_errors`
+
+        """
+        key = (category, idtf)
+        if key in self.__fetched_results:
+            if self.verbose > 3:
+                print_func(f"fetched content of {idtf} found in memory")
+            return self.__fetched_results[key]
+        if key in self.__prefetch_errors:
+            return self.__prefetch_errors[key]
+        if category == "doi":
+            res = self._handle_doi(feed_content)
+        elif category == "pm":
+            res = self._handle_pm(feed_content)
+        elif category == "arxiv":
+            res = self._handle_arxiv(feed_content)
+        elif category == "error" or re.findall(
+            "|".join(self.__exceptional_doi_domains), idtf
+        ):
+            res = self.default_err
+
+        res = self._handle_network_error(res)
+
+        # only results that look like a bib entry are memorized,
+        # errors and anything unexpected (e.g. an error page) are retried
+        if self.fetch_cache_limit > 0 and (
+            isinstance(res, dict) or res.lstrip().startswith("@")
+        ):
+            self.__fetched_results[key] = res
+            while len(self.__fetched_results) > self.fetch_cache_limit:
+                self.__fetched_results.popitem(last=False)
+        return res
+
+    def _prefetch(
+        self,
+        identifiers: Sequence[str],
+        arxiv2doi: Optional[bool] = None,
+        timeout: Optional[float] = None,
+    ) -> NoReturn:
+        """
+        fetch the raw lookup results of multiple DOIs concurrently,
+        so that the subsequent (sequential) lookups are served from memory,
+        arXiv and PubMed identifiers are left to the sequential lookups
+
+        Parameters
+        ----------
+        identifiers: sequence of str,
+            identifiers of the publications
+        arxiv2doi: bool, optional,
+            whether to convert arXiv ID to DOI to look up,
+            if specified, `self._arxiv2doi` is ignored
+        timeout: float, optional,
+            timeout for the network request,
+            if specified, `self.timeout` is ignored
+
+        """
+        if self.prefetch_workers <= 1 or not (
+            1 < len(identifiers) <= self.fetch_cache_limit
+        ):
+            return
+        original_verbose = self.verbose
+        self.verbose = 0
+        try:
+            with warnings.catch_warnings():
+                # unrecognized identifiers are warned in the sequential lookups
+                warnings.simplefilter("ignore")
+                feed_contents = {}
+                for item in identifiers:
+                    category, fc, idtf = self._obtain_feed_content(
+                        item, arxiv2doi, timeout
+                    )
+                    if category == "doi":
+                        feed_contents[(category, idtf)] = (category, fc, idtf)
+        finally:
+            self.verbose = original_verbose
+        if len(feed_contents) < 2:
+            return
+
+        def _fetch_quietly(
+            args: Tuple[str, dict, str]
+        ) -> Optional[Union[str, Dict[str, str]]]:
+            try:
+                return self._fetch(*args)
+            except Exception:
+                # exceptions are raised again in the sequential lookups
+                return None
+
+        with ThreadPoolExecutor(
+            max_workers=min(self.prefetch_workers, len(feed_contents))
+        ) as executor:
+            results = list(executor.map(_fetch_quietly, feed_contents.values()))
+        for key, res in zip(feed_contents, results):
+            if res is not None and key not in self.__fetched_results:
+                self.__prefetch_errors[key] = res
+
     def _obtain_feed_content(
         self,
         identifier: str,
@@ -442,12 +592,8 @@ class BibLookup(ReprMixin):
         idtf = identifier.lower().strip()
         _arxiv2doi = self._arxiv2doi if arxiv2doi is None else arxiv2doi
         fc = {"timeout": self.timeout if timeout is None else timeout}
-        if re.search(self.doi_pattern, idtf):
-            idtf = re.sub(
-                self.doi_pattern_prefix,
-                "",
-                idtf,
-            ).strip("/")
+        if self.__doi_regex.search(idtf):
+            idtf = self.__doi_prefix_regex.sub("", idtf).strip("/")
             url = self.__URL__["doi"] + idtf
             fc.update(
                 {
@@ -456,12 +602,8 @@ class BibLookup(ReprMixin):
                 }
             )
             category = "doi"
-        elif re.search(self.pm_pattern, idtf):
-            idtf = re.sub(
-                self.pm_pattern_prefix,
-                "",
-                idtf,
-            ).strip("/")
+        elif self.__pm_regex.search(idtf):
+            idtf = self.__pm_prefix_regex.sub("", idtf).strip("/")
             url = self.__URL__["pm"] + idtf
             fc.update(
                 {
@@ -469,12 +611,8 @@ class BibLookup(ReprMixin):
                 }
             )
             category = "pm"
-        elif re.search(self.arxiv_pattern, idtf):
-            idtf = re.sub(
-                self.arxiv_pattern_prefix,
-                "",
-                idtf,
-            ).strip("/")
+        elif self.__arxiv_regex.search(idtf):
+            idtf = self.__arxiv_prefix_regex.sub("", idtf).strip("/")
             url = self.__URL__["arxiv"] + idtf
             fc.update(
                 {
@@ -514,8 +652,11 @@ class BibLookup(ReprMixin):
 
         """
         try:
-            r = requests.post(**feed_content)
+            r = self.session.post(**feed_content)
             res = r.content.decode("utf-8")
+            if not r.ok and "DOI Not Found" not in res:
+                # e.g. 5xx error pages, not a (negative) lookup result
+                res = self.network_err
         except requests.Timeout:
             res = self.timeout_err
         except requests.RequestException:
@@ -540,7 +681,8 @@ class BibLookup(ReprMixin):
 
         """
         try:
-            r = requests.post(**feed_content)
+            r = self.session.post(**feed_content)
+            r.raise_for_status()
             if self.verbose > 1:
                 print_func(r.json())
             mid_res = r.json()["records"][0]
@@ -578,7 +720,8 @@ class BibLookup(ReprMixin):
 
         """
         try:
-            r = requests.get(**feed_content)
+            r = self.session.get(**feed_content)
+            r.raise_for_status()
         except requests.Timeout:
             res = self.timeout_err
             return res
@@ -667,11 +810,9 @@ class BibLookup(ReprMixin):
                 line.strip()
                 for line in res.split("\n")
                 if len(line.strip()) > 0
-                and not re.match(self._comment_pattern, line.strip())
+                and not self._comment_pattern.match(line.strip())
             ]
-            header_dict = list(re.finditer(self.bib_header_pattern, lines[0]))[
-                0
-            ].groupdict()
+            header_dict = self.__header_regex.search(lines[0]).groupdict()
             field_dict = OrderedDict()
             for line in lines[1:-1]:
                 key, *val = line.strip().split("=")  # urls might contain "="
@@ -874,10 +1015,9 @@ class BibLookup(ReprMixin):
             return
 
         with open(_output_file, "a") as f:
-            f.writelines(
-                "\n".join([str(self.__cached_lookup_results[i]) for i in identifiers])
-                + "\n"
-            )
+            # write the bib items one by one, instead of joining them into one string
+            for i in identifiers:
+                f.write(f"{self.__cached_lookup_results[i]}\n")
 
         print_func(
             f"Bib items written to {process_text(str(_output_file), self.__info_color)}"
@@ -917,28 +1057,37 @@ class BibLookup(ReprMixin):
         assert (
             _bib_file.suffix == ".bib"
         ), f"bib_file must be a .bib file, but got {_bib_file}"
-        if not _bib_file.exists():
+        try:
+            f = open(_bib_file, "r")
+        except FileNotFoundError:
             return []
         bib_items = []
         lines = []
         line_numbers = []
-        for idx, line in enumerate(_bib_file.read_text().splitlines()):
-            line = line.strip(", ")
-            if re.match(self._comment_pattern, line) or len(line) == 0:
-                continue
-            if line.startswith("@"):
-                line_numbers.append(idx)
-                if len(lines) > 0:
-                    if not re.search("bstctl", lines[0].lower()):
-                        # ignore_fields should be set empty
-                        # to keep it unchanged
-                        bib_item = self._to_bib_item("\n".join(lines), ignore_fields=[])
-                        bib_items.append(bib_item)
-                        if cache:
-                            self.__cached_lookup_results[bib_item.identifier] = bib_item
-                    lines = []
-            lines.append(line)
-        if len(lines) > 0 and not re.search("bstctl", lines[0].lower()):
+        # iterate over the file lazily instead of reading it as a whole,
+        # so that memory usage does not scale with the size of the bib file
+        with f:
+            for idx, line in enumerate(f):
+                line = line.rstrip("\r\n").strip(", ")
+                if len(line) == 0 or self._comment_pattern.match(line):
+                    continue
+                if line.startswith("@"):
+                    line_numbers.append(idx)
+                    if len(lines) > 0:
+                        if "bstctl" not in lines[0].lower():
+                            # ignore_fields should be set empty
+                            # to keep it unchanged
+                            bib_item = self._to_bib_item(
+                                "\n".join(lines), ignore_fields=[]
+                            )
+                            bib_items.append(bib_item)
+                            if cache:
+                                self.__cached_lookup_results[
+                                    bib_item.identifier
+                                ] = bib_item
+                        lines = []
+                lines.append(line)
+        if len(lines) > 0 and "bstctl" not in lines[0].lower():
             bib_item = self._to_bib_item("\n".join(lines), ignore_fields=[])
             bib_items.append(bib_item)
             if cache:
@@ -973,10 +1122,21 @@ class BibLookup(ReprMixin):
         for i in identifiers:
             self.__cached_lookup_results.pop(i, None)
 
-    def clear_cache(self) -> NoReturn:
-        """helper function to clear the cached bib items"""
+    def clear_cache(self, fetched_results: bool = True) -> NoReturn:
+        """
+        helper function to clear the cached bib items
+
+        Parameters
+        ----------
+        fetched_results: bool, default True,
+            whether to also clear the fetched (raw) lookup results kept in memory,
+            so that the publications are queried again on the next lookup
+
+        """
         for item in list(self):
             self.pop(item)
+        if fetched_results:
+            self.__fetched_results.clear()
 
     def print(self) -> NoReturn:
         """print the bib items in the cache"""
@@ -1044,10 +1204,11 @@ class BibLookup(ReprMixin):
             the starting line numbers of the invalid bib items
 
         """
-        _bib_file = Path(bib_file).resolve()
+        # `read_bib_file` resolves the path, no need to resolve it twice
+        _bib_file = Path(bib_file)
         assert _bib_file.exists() and _bib_file.suffix == ".bib", "Not a valid Bib file"
         bib_items, line_numbers = self.read_bib_file(
-            bib_file=bib_file, cache=False, return_line_numbers=True
+            bib_file=_bib_file, cache=False, return_line_numbers=True
         )
         err_lines = set()
         for ln, bi in zip(line_numbers, bib_items):
@@ -1060,10 +1221,7 @@ class BibLookup(ReprMixin):
                     f"{whitespace * 4}Bib item of entry type "
                     f"\042{process_text(bi.entry_type, self.__err_color, font_size=self.__err_fontsize)}\042 "
                     f"should have the following fields:{newline}{whitespace * 4}"
-                    + process_text(
-                        f"{DF_BIB_ENTRY_TYPES[DF_BIB_ENTRY_TYPES.entry_type==bi.entry_type].iloc[0].required_fields}",
-                        self.__info_color,
-                    )
+                    + process_text(f"{bi.required_fields}", self.__info_color)
                     + newline
                 )
                 err_lines.add(ln)
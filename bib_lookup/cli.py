@@ -5,7 +5,7 @@ Command-line interface for the bib_lookup package.
 
 import argparse
 from pathlib import Path
-from typing import Union
+from typing import Union, Optional, Sequence
 
 try:
     from bib_lookup.bib_lookup import BibLookup
@@ -40,6 +40,20 @@ def required_length(nmin: int, nmax: int) -> argparse.Action:
     return RequiredLength
 
 
+_STR2BOOL = {
+    "yes": True,
+    "true": True,
+    "t": True,
+    "y": True,
+    "1": True,
+    "no": False,
+    "false": False,
+    "f": False,
+    "n": False,
+    "0": False,
+}
+
+
 def str2bool(v: Union[str, bool]) -> bool:
     """
 
@@ -61,20 +75,24 @@ def str2bool(v: Union[str, bool]) -> bool:
 
     """
     if isinstance(v, bool):
-        b = v
-    elif v.lower() in ("yes", "true", "t", "y", "1"):
-        b = True
-    elif v.lower() in ("no", "false", "f", "n", "0"):
-        b = False
-    else:
+        return v
+    b = _STR2BOOL.get(v.lower(), None)
+    if b is None:
         raise ValueError("Boolean value expected.")
     return b
 
 
-def main():
+def main(argv: Optional[Sequence[str]] = None):
     """
     Command-line interface for the bib_lookup package.
 
+    Parameters
+    ----------
+    argv: sequence of str, optional,
+        the command-line arguments (without the program name),
+        defaults to ``sys.argv[1:]``,
+        passing them explicitly allows invoking the CLI in-process
+
     """
     parser = argparse.ArgumentParser(
         description="Look up a BibTeX entry from a DOI identifier, PMID (URL) or arXiv ID (URL)."
@@ -148,7 +166,7 @@ def main():
         dest="arxiv2doi",
     )
 
-    args = vars(parser.parse_args())
+    args = vars(parser.parse_args(argv))
 
     check_file = args["check_file"]
     if check_file is not None:
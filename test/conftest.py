@@ -0,0 +1,141 @@
+import re
+from pathlib import Path
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import bib_lookup
+except ModuleNotFoundError:
+    import sys
+
+    sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+    import bib_lookup
+
+
+_CWD = Path(__file__).absolute().parent
+
+DOI_EXAMPLES = {
+    "DOI: 10.1142/S1005386718000305": "@article{Wen_2018,\n      title = {Counting Multiplicities in a Hypersurface over Number Fields},\n     author = {Hao Wen and Chunhui Liu},\n    journal = {Algebra Colloquium},\n        doi = {10.1142/s1005386718000305},\n       year = {2018},\n      month = {8},\n  publisher = {World Scientific Pub Co Pte Lt},\n     volume = {25},\n     number = {03},\n      pages = {437--458}\n}",
+    "10.1109/ICCVW.2019.00246": "@inproceedings{Cao_2019,\n      title = {{GCNet}: Non-Local Networks Meet Squeeze-Excitation Networks and Beyond},\n     author = {Yue Cao and Jiarui Xu and Stephen Lin and Fangyun Wei and Han Hu},\n  booktitle = {2019 {IEEE}/{CVF} International Conference on Computer Vision Workshop ({ICCVW})},\n        doi = {10.1109/iccvw.2019.00246},\n       year = {2019},\n      month = {10},\n  publisher = {{IEEE}}\n}",
+    "10.1109/tpami.2019.2913372": "@article{Hu_2020,\n      title = {Squeeze-and-Excitation Networks},\n     author = {Jie Hu and Li Shen and Samuel Albanie and Gang Sun and Enhua Wu},\n    journal = {{IEEE} Transactions on Pattern Analysis and Machine Intelligence},\n        doi = {10.1109/tpami.2019.2913372},\n       year = {2020},\n      month = {8},\n  publisher = {Institute of Electrical and Electronics Engineers ({IEEE})},\n     volume = {42},\n     number = {8},\n      pages = {2011--2023}\n}",
+    "doi.org/10.1007/s11263-019-01198-w": "@article{Wu_2019,\n      title = {Group Normalization},\n     author = {Yuxin Wu and Kaiming He},\n    journal = {International Journal of Computer Vision},\n        doi = {10.1007/s11263-019-01198-w},\n       year = {2019},\n      month = {7},\n  publisher = {Springer Science and Business Media {LLC}},\n     volume = {128},\n     number = {3},\n      pages = {742--755}\n}",
+    "https://doi.org/10.23919/cinc53138.2021.9662801": "@inproceedings{Wen_2021,\n      title = {Hybrid Arrhythmia Detection on Varying-Dimensional Electrocardiography: Combining Deep Neural Networks and Clinical Rules},\n     author = {Hao Wen and Jingsu Kang},\n  booktitle = {2021 Computing in Cardiology ({CinC})},\n        doi = {10.23919/cinc53138.2021.9662801},\n       year = {2021},\n      month = {9},\n  publisher = {{IEEE}}\n}",
+}
+
+
+def _doi_url(lookup_result: str) -> str:
+    return "https://doi.org/" + re.search(r"doi = \{(.+?)\}", lookup_result).group(1)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--network",
+        action="store_true",
+        default=False,
+        help="also run the tests that perform real lookups over the network",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "network: test performs real lookups over the network, "
+        "only run with the --network option",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--network"):
+        return
+    skip_network = pytest.mark.skip(reason="needs the --network option to run")
+    for item in items:
+        if "network" in item.keywords:
+            item.add_marker(skip_network)
+
+
+class StubAdapter(HTTPAdapter):
+    """transport adapter serving canned responses by URL, without network access"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._table = {}
+        self.calls = []
+
+    def register(self, url: str, content: str, status_code: int = 200) -> None:
+        self._table[url] = (content.encode("utf-8"), status_code)
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        self.calls.append(request.url)
+        content, status_code = self._table[request.url]
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = content
+        response.url = request.url
+        response.request = request
+        return response
+
+
+@pytest.fixture(scope="session")
+def bl():
+    # one instance (hence one keep-alive session) shared by the lookup tests
+    return bib_lookup.BibLookup(session=requests.Session())
+
+
+@pytest.fixture
+def stub_adapter():
+    return StubAdapter()
+
+
+@pytest.fixture
+def offline_bl(stub_adapter):
+    bl = bib_lookup.BibLookup()
+    bl.session.mount("http://", stub_adapter)
+    bl.session.mount("https://", stub_adapter)
+    return bl
+
+
+@pytest.fixture
+def offline_sessions(monkeypatch, stub_adapter):
+    # for code paths that create their own BibLookup (e.g. the CLI),
+    # mount the stub adapter on every newly created session
+    _Session = requests.Session
+
+    def _offline_session() -> requests.Session:
+        session = _Session()
+        session.mount("http://", stub_adapter)
+        session.mount("https://", stub_adapter)
+        return session
+
+    monkeypatch.setattr(requests, "Session", _offline_session)
+    return stub_adapter
+
+
+@pytest.fixture(scope="session")
+def doi_examples():
+    return DOI_EXAMPLES
+
+
+@pytest.fixture
+def doi_stub_adapter(stub_adapter, doi_examples):
+    # serve every DOI example from doi.org,
+    # the formatted lookup results doubling as the responses
+    for lookup_result in doi_examples.values():
+        stub_adapter.register(_doi_url(lookup_result), lookup_result)
+    return stub_adapter
+
+
+@pytest.fixture(scope="session")
+def invalid_items_err_lines():
+    return bib_lookup.BibLookup().check_bib_file(_CWD / "invalid_items.bib")
+
+
+@pytest.fixture(scope="session")
+def sample_inputs():
+    return (_CWD / "sample_input.txt").read_text().splitlines()
+
+
+@pytest.fixture(scope="session")
+def expected_outputs():
+    return (_CWD / "expected_output.bib").read_text().strip(" \n")
@@ -1,3 +1,5 @@
+import pytest
+
 try:
     import bib_lookup
 except ModuleNotFoundError:
@@ -16,14 +18,14 @@ arXiv_examples = {
 }
 
 
-bl = bib_lookup.BibLookup()
+pytestmark = pytest.mark.network
 
 
-def test_arxiv_bib_lookup():
+def test_arxiv_bib_lookup(bl):
     for arXiv_id, lookup_result in arXiv_examples.items():
         bib_string = bl(arXiv_id)
         assert bib_string == lookup_result
 
 
 if __name__ == "__main__":
-    test_arxiv_bib_lookup()
+    test_arxiv_bib_lookup(bib_lookup.BibLookup())
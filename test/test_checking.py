@@ -14,11 +14,9 @@ _CWD = Path(__file__).absolute().parent
 _INPUT_FILE = _CWD / "invalid_items.bib"
 
 
-def test_checking():
-    bl = bib_lookup.BibLookup()
-    err_lines = bl.check_bib_file(_INPUT_FILE)
-    assert err_lines == [3, 16, 45]
+def test_checking(invalid_items_err_lines):
+    assert invalid_items_err_lines == [3, 16, 45]
 
 
 if __name__ == "__main__":
-    test_checking()
+    test_checking(bib_lookup.BibLookup().check_bib_file(_INPUT_FILE))
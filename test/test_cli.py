@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import pytest
+
+try:
+    from bib_lookup.cli import main, str2bool
+except ModuleNotFoundError:
+    import sys
+
+    sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+    from bib_lookup.cli import main, str2bool
+
+
+_CWD = Path(__file__).absolute().parent
+
+_INVALID_ITEMS_FILE = _CWD / "invalid_items.bib"
+
+_TRUE_STRS = ["yes", "Yes", "true", "True", "TRUE", "t", "y", "1"]
+_FALSE_STRS = ["no", "No", "false", "False", "FALSE", "f", "n", "0"]
+
+_INVALID_ARGUMENTS = [
+    ([], AssertionError, "No identifiers given"),
+    (["--check-file", "yes"], AssertionError, "No identifiers given"),
+    (["--check-file", "maybe"], ValueError, "Boolean value expected"),
+    # argparse exits with status 2 on an invalid choice
+    (["--align", "right"], SystemExit, "^2$"),
+]
+
+_DOI = "10.1142/S1005386718000305"
+
+
+def test_cli_check_file(capsys):
+    main(["--check-file", str(_INVALID_ITEMS_FILE)])
+    captured = capsys.readouterr()
+    assert "starting from line 3 is not valid" in captured.out
+    assert "is duplicate" in captured.out
+
+
+def test_cli_lookup_print(offline_sessions, doi_stub_adapter, capsys):
+    main([_DOI])
+    assert "@article{Wen_2018," in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("from_input_file", [False, True])
+def test_cli_lookup_output(
+    from_input_file, offline_sessions, doi_stub_adapter, tmp_path
+):
+    output_file = tmp_path / "test_cli_output.bib"
+    if from_input_file:
+        input_file = tmp_path / "test_cli_input.txt"
+        input_file.write_text(f"DOI: {_DOI}\n")
+        argv = ["-i", str(input_file)]
+    else:
+        argv = [_DOI]
+    main(argv + ["-o", str(output_file), "-c", "true"])
+    assert output_file.read_text().startswith("@article{Wen_2018,")
+
+
+@pytest.mark.parametrize("argv, error, match", _INVALID_ARGUMENTS)
+def test_cli_invalid_arguments(argv, error, match):
+    with pytest.raises(error, match=match):
+        main(argv)
+
+
+@pytest.mark.parametrize(
+    "v, expected",
+    [(v, True) for v in _TRUE_STRS + [True]]
+    + [(v, False) for v in _FALSE_STRS + [False]],
+)
+def test_str2bool(v, expected):
+    assert str2bool(v) is expected
+
+
+@pytest.mark.parametrize("v", ["maybe", "", "2"])
+def test_str2bool_invalid(v):
+    with pytest.raises(ValueError, match="Boolean value expected"):
+        str2bool(v)
+
+
+if __name__ == "__main__":
+    for _argv, _error, _match in _INVALID_ARGUMENTS:
+        test_cli_invalid_arguments(_argv, _error, _match)
+    for _v in _TRUE_STRS + [True]:
+        test_str2bool(_v, True)
+    for _v in _FALSE_STRS + [False]:
+        test_str2bool(_v, False)
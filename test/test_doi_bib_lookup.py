@@ -1,30 +1,159 @@
+import sys
+
+import pytest
+
 try:
     import bib_lookup
 except ModuleNotFoundError:
     from pathlib import Path
-    import sys
 
     sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
     import bib_lookup
 
+from bib_lookup.utils import NETWORK_ERROR_MESSAGES
 
-doi_examples = {
-    "DOI: 10.1142/S1005386718000305": "@article{Wen_2018,\n      title = {Counting Multiplicities in a Hypersurface over Number Fields},\n     author = {Hao Wen and Chunhui Liu},\n    journal = {Algebra Colloquium},\n        doi = {10.1142/s1005386718000305},\n       year = {2018},\n      month = {8},\n  publisher = {World Scientific Pub Co Pte Lt},\n     volume = {25},\n     number = {03},\n      pages = {437--458}\n}",
-    "10.1109/ICCVW.2019.00246": "@inproceedings{Cao_2019,\n      title = {{GCNet}: Non-Local Networks Meet Squeeze-Excitation Networks and Beyond},\n     author = {Yue Cao and Jiarui Xu and Stephen Lin and Fangyun Wei and Han Hu},\n  booktitle = {2019 {IEEE}/{CVF} International Conference on Computer Vision Workshop ({ICCVW})},\n        doi = {10.1109/iccvw.2019.00246},\n       year = {2019},\n      month = {10},\n  publisher = {{IEEE}}\n}",
-    "10.1109/tpami.2019.2913372": "@article{Hu_2020,\n      title = {Squeeze-and-Excitation Networks},\n     author = {Jie Hu and Li Shen and Samuel Albanie and Gang Sun and Enhua Wu},\n    journal = {{IEEE} Transactions on Pattern Analysis and Machine Intelligence},\n        doi = {10.1109/tpami.2019.2913372},\n       year = {2020},\n      month = {8},\n  publisher = {Institute of Electrical and Electronics Engineers ({IEEE})},\n     volume = {42},\n     number = {8},\n      pages = {2011--2023}\n}",
-    "doi.org/10.1007/s11263-019-01198-w": "@article{Wu_2019,\n      title = {Group Normalization},\n     author = {Yuxin Wu and Kaiming He},\n    journal = {International Journal of Computer Vision},\n        doi = {10.1007/s11263-019-01198-w},\n       year = {2019},\n      month = {7},\n  publisher = {Springer Science and Business Media {LLC}},\n     volume = {128},\n     number = {3},\n      pages = {742--755}\n}",
-    "https://doi.org/10.23919/cinc53138.2021.9662801": "@inproceedings{Wen_2021,\n      title = {Hybrid Arrhythmia Detection on Varying-Dimensional Electrocardiography: Combining Deep Neural Networks and Clinical Rules},\n     author = {Hao Wen and Jingsu Kang},\n  booktitle = {2021 Computing in Cardiology ({CinC})},\n        doi = {10.23919/cinc53138.2021.9662801},\n       year = {2021},\n      month = {9},\n  publisher = {{IEEE}}\n}",
-}
 
+_RAW_DOI_RESPONSE = """@article{Wen_2018,
+\tdoi = {10.1142/s1005386718000305},
+\turl = {https://doi.org/10.1142%2Fs1005386718000305},
+\tyear = 2018,
+\tmonth = {aug},
+\tpublisher = {World Scientific Pub Co Pte Lt},
+\tvolume = {25},
+\tnumber = {03},
+\tpages = {437--458},
+\tauthor = {Hao Wen and Chunhui Liu},
+\ttitle = {Counting Multiplicities in a Hypersurface over Number Fields},
+\tjournal = {Algebra Colloquium}
+}"""
 
-bl = bib_lookup.BibLookup()
+
+@pytest.mark.network
+def test_doi_bib_lookup(bl, doi_examples):
+    # one batched call, the lookups of which are fetched concurrently
+    bl(list(doi_examples))
+    for doi, lookup_result in doi_examples.items():
+        assert str(bl[doi]) == lookup_result
 
 
-def test_doi_bib_lookup():
+def test_doi_bib_lookup_formatting_idempotent(
+    offline_bl, doi_stub_adapter, doi_examples
+):
+    # the formatted expected outputs are served as the doi.org responses,
+    # which checks that formatting them again leaves them unchanged
+    offline_bl(list(doi_examples))
     for doi, lookup_result in doi_examples.items():
-        bib_string = bl(doi)
-        assert bib_string == lookup_result
+        assert str(offline_bl[doi]) == lookup_result
+    assert len(doi_stub_adapter.calls) == len(doi_examples)
+
+
+def test_doi_bib_lookup_raw_response(offline_bl, stub_adapter, doi_examples):
+    # BibTeX as served by doi.org: tab indented, unaligned, with an url field,
+    # a bare year and the month abbreviation
+    doi = "DOI: 10.1142/S1005386718000305"
+    stub_adapter.register(
+        "https://doi.org/10.1142/s1005386718000305", _RAW_DOI_RESPONSE
+    )
+    assert offline_bl(doi) == doi_examples[doi]
+
+
+def test_repeated_lookup_fetched_once(offline_bl, doi_stub_adapter, doi_examples):
+    doi = "DOI: 10.1142/S1005386718000305"
+    assert offline_bl(doi) == doi_examples[doi]
+    # same publication, different identifier format and output options
+    bib_string = offline_bl("10.1142/S1005386718000305", label="wen2018")
+    assert bib_string.startswith("@article{wen2018,")
+    assert len(doi_stub_adapter.calls) == 1
+
+
+def test_clear_cache_refetches(offline_bl, doi_stub_adapter, doi_examples):
+    doi = "DOI: 10.1142/S1005386718000305"
+    offline_bl(doi)
+    offline_bl.clear_cache(fetched_results=False)
+    offline_bl(doi)
+    assert len(doi_stub_adapter.calls) == 1
+    offline_bl.clear_cache()
+    assert len(offline_bl) == 0
+    assert offline_bl(doi) == doi_examples[doi]
+    assert len(doi_stub_adapter.calls) == 2
+
+
+def test_server_error_not_memoized(offline_bl, doi_stub_adapter, doi_examples):
+    doi = "DOI: 10.1142/S1005386718000305"
+    url = "https://doi.org/10.1142/s1005386718000305"
+    doi_stub_adapter.register(
+        url, "<html><body>Service temporarily unavailable</body></html>", 503
+    )
+    assert offline_bl(doi) == offline_bl.network_err
+    # the upstream recovers, the next lookup queries it again
+    doi_stub_adapter.register(url, doi_examples[doi])
+    assert offline_bl(doi) == doi_examples[doi]
+    assert len(doi_stub_adapter.calls) == 2
+
+
+def test_multiple_lookups_prefetched(offline_bl, doi_stub_adapter, doi_examples):
+    dois = ["DOI: 10.1142/S1005386718000305", "10.1109/tpami.2019.2913372"]
+    assert offline_bl(dois) == "\n".join(doi_examples[doi] for doi in dois)
+    assert len(doi_stub_adapter.calls) == 2
+    assert len(offline_bl) == 2 and offline_bl[0] == dois[0]
+
+
+def test_prefetch_restores_verbose(offline_bl, doi_examples, monkeypatch):
+    def _interrupted(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    offline_bl.verbose = 2
+    monkeypatch.setattr(offline_bl, "_obtain_feed_content", _interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        offline_bl(list(doi_examples))
+    assert offline_bl.verbose == 2
+
+
+def _no_thread_pool(*args, **kwargs):
+    raise AssertionError("the lookups are not expected to be sent concurrently")
+
+
+def test_prefetch_disabled(offline_bl, doi_stub_adapter, doi_examples, monkeypatch):
+    monkeypatch.setattr(
+        sys.modules[bib_lookup.BibLookup.__module__],
+        "ThreadPoolExecutor",
+        _no_thread_pool,
+    )
+    offline_bl.prefetch_workers = 0
+    assert offline_bl(list(doi_examples)) == "\n".join(doi_examples.values())
+
+
+def test_arxiv_and_pubmed_not_prefetched(offline_bl, stub_adapter, monkeypatch):
+    monkeypatch.setattr(
+        sys.modules[bib_lookup.BibLookup.__module__],
+        "ThreadPoolExecutor",
+        _no_thread_pool,
+    )
+    identifiers = ["arXiv:2106.10421", "arXiv:2106.10422", "20339075"]
+    for item in identifiers:
+        _, feed_content, _ = offline_bl._obtain_feed_content(item)
+        stub_adapter.register(feed_content["url"], "Service Unavailable", 503)
+    assert offline_bl(identifiers) == "\n".join([offline_bl.network_err] * 3)
+    assert len(stub_adapter.calls) == 3
+
+
+def test_prefetch_errors_reused(offline_bl, stub_adapter, doi_examples):
+    dois = list(doi_examples)[:2]
+    for doi in dois:
+        _, feed_content, _ = offline_bl._obtain_feed_content(doi)
+        stub_adapter.register(feed_content["url"], "Service Unavailable", 503)
+    assert offline_bl(dois) == "\n".join([offline_bl.network_err] * 2)
+    # the failed prefetches are not sent again by the sequential lookups
+    assert len(stub_adapter.calls) == 2
+
+
+@pytest.mark.parametrize("msg", NETWORK_ERROR_MESSAGES)
+def test_handle_network_error_variants(offline_bl, stub_adapter, msg):
+    stub_adapter.register("https://doi.org/10.1142/s1005386718000305", msg)
+    assert offline_bl("DOI: 10.1142/S1005386718000305") == offline_bl.network_err
 
 
 if __name__ == "__main__":
-    test_doi_bib_lookup()
+    from conftest import DOI_EXAMPLES
+
+    test_doi_bib_lookup(bib_lookup.BibLookup(), DOI_EXAMPLES)
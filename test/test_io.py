@@ -1,6 +1,8 @@
-import os
+import tempfile
 from pathlib import Path
 
+import pytest
+
 try:
     import bib_lookup
 except ModuleNotFoundError:
@@ -13,46 +15,61 @@ except ModuleNotFoundError:
 _CWD = Path(__file__).absolute().parent
 
 _SAMPLE_INPUT_FILE = _CWD / "sample_input.txt"
-_SAMPLE_INPUTS = _SAMPLE_INPUT_FILE.read_text().splitlines()
 _EXPECTED_OUTPUT_FILE = _CWD / "expected_output.bib"
-_EXPECTED_OUTPUTS = _EXPECTED_OUTPUT_FILE.read_text().strip(" \n")
-_OUTPUT_FILE = _CWD / "test_output.bib"
 
 _LARGE_DATABASE_FILE = _CWD / "large_database.bib"
 
 
-bl = bib_lookup.BibLookup(output_file=_OUTPUT_FILE)
+pytestmark = pytest.mark.network
+
+
+@pytest.fixture(scope="module")
+def bl():
+    # not the session-wide instance, since the tests here check the cache size
+    return bib_lookup.BibLookup()
+
+
+@pytest.fixture
+def output_file(tmp_path):
+    return tmp_path / "test_output.bib"
 
 
-def test_io_from_file():
+def test_io_from_file(bl, expected_outputs, output_file):
     lookup_result = bl(_SAMPLE_INPUT_FILE)
-    assert lookup_result == _EXPECTED_OUTPUTS
+    assert lookup_result == expected_outputs
     assert len(bl) == 3
     bib_identifier, bib_item = bl[1], bl[bl[1]]
-    bl.save([0, 2])
+    bl.save([0, 2], output_file)
     assert len(bl) == 1
     assert (bib_identifier, bib_item) == (bl[0], bl[bl[0]])
-    bl.save()
+    bl.save(output_file=output_file)
     assert len(bl) == 0
-    os.remove(_OUTPUT_FILE)
 
     bib_items = bl.read_bib_file(_LARGE_DATABASE_FILE, cache=True)
     assert len(bib_items) == len(bl) == 608
-    bl.clear_cache()
+    # keep the fetched lookups for test_io_from_list
+    bl.clear_cache(fetched_results=False)
     assert len(bl) == 0
 
 
-def test_io_from_list():
-    lookup_result = bl(_SAMPLE_INPUTS)
-    assert lookup_result == _EXPECTED_OUTPUTS
+def test_io_from_list(bl, sample_inputs, expected_outputs, output_file):
+    lookup_result = bl(sample_inputs)
+    assert lookup_result == expected_outputs
     assert len(bl) == 3
-    bl.save(bl[0])
+    bl.save(bl[0], output_file)
     assert len(bl) == 2
-    bl.save()
-    assert _OUTPUT_FILE.read_text().strip(" \n") == _EXPECTED_OUTPUTS
-    os.remove(_OUTPUT_FILE)
+    bl.save(output_file=output_file)
+    assert output_file.read_text().strip(" \n") == expected_outputs
 
 
 if __name__ == "__main__":
-    test_io_from_file()
-    test_io_from_list()
+    _bl = bib_lookup.BibLookup()
+    _expected_outputs = _EXPECTED_OUTPUT_FILE.read_text().strip(" \n")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_io_from_file(_bl, _expected_outputs, Path(tmp_dir) / "from_file.bib")
+        test_io_from_list(
+            _bl,
+            _SAMPLE_INPUT_FILE.read_text().splitlines(),
+            _expected_outputs,
+            Path(tmp_dir) / "from_list.bib",
+        )
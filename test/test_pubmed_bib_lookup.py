@@ -1,3 +1,7 @@
+import json
+
+import pytest
+
 try:
     import bib_lookup
 except ModuleNotFoundError:
@@ -16,14 +20,30 @@ pubmed_examples = {
 }
 
 
-bl = bib_lookup.BibLookup()
-
-
-def test_pubmed_bib_lookup():
+@pytest.mark.network
+def test_pubmed_bib_lookup(bl):
+    # one batched call, the lookups of which are fetched concurrently
+    bl(list(pubmed_examples))
     for pmid, lookup_result in pubmed_examples.items():
-        bib_string = bl(pmid)
-        assert bib_string == lookup_result
+        assert str(bl[pmid]) == lookup_result
+
+
+def test_pubmed_bib_lookup_offline(offline_bl, stub_adapter):
+    pmid = "PMID: 35344711"
+    doi = "10.1016/j.cell.2022.03.009"
+    stub_adapter.register(
+        f"{offline_bl.__URL__['pm']}35344711",
+        json.dumps({"records": [{"pmid": "35344711", "doi": doi}]}),
+    )
+    stub_adapter.register(f"https://doi.org/{doi}", pubmed_examples[pmid])
+    assert offline_bl(pmid) == pubmed_examples[pmid]
+    # records without DOI can not be looked up
+    stub_adapter.register(
+        f"{offline_bl.__URL__['pm']}20339075",
+        json.dumps({"records": [{"pmid": "20339075"}]}),
+    )
+    assert offline_bl("20339075") == offline_bl.default_err
 
 
 if __name__ == "__main__":
-    test_pubmed_bib_lookup()
+    test_pubmed_bib_lookup(bib_lookup.BibLookup())
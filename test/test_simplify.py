@@ -0,0 +1,46 @@
+import tempfile
+from pathlib import Path
+
+import pytest
+
+try:
+    import bib_lookup
+except ModuleNotFoundError:
+    import sys
+
+    sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+    import bib_lookup
+
+
+_CWD = Path(__file__).absolute().parent
+
+_LARGE_DATABASE_FILE = _CWD / "large_database.bib"
+
+_TEX_SOURCE = r"""\documentclass{article}
+\begin{document}
+As shown in \cite{olson2017behind, collins2015new} and \citet{liu2011dbnsfp}.
+\end{document}
+"""
+
+
+def test_simplify_bib_file(tmp_path):
+    tex_source = tmp_path / "main.tex"
+    tex_source.write_text(_TEX_SOURCE)
+    output_file = tmp_path / "simplified.bib"
+
+    assert bib_lookup.BibLookup.simplify_bib_file(
+        str(tex_source), _LARGE_DATABASE_FILE, output_file
+    ) == str(output_file)
+    labels = [bi.label for bi in bib_lookup.BibLookup().read_bib_file(output_file)]
+    assert sorted(labels) == ["collins2015new", "liu2011dbnsfp", "olson2017behind"]
+
+    # the existence of the output file is checked before parsing the bib file
+    with pytest.raises(FileExistsError):
+        bib_lookup.BibLookup.simplify_bib_file(
+            str(tex_source), _LARGE_DATABASE_FILE, output_file
+        )
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as _tmp_dir:
+        test_simplify_bib_file(Path(_tmp_dir))
@@ -0,0 +1,226 @@
+import re
+import tempfile
+from pathlib import Path
+
+import pytest
+
+try:
+    from bib_lookup.utils import (
+        color_text,
+        gather_tex_source_files_in_one,
+        md_text,
+        printmd,
+    )
+except ModuleNotFoundError:
+    import sys
+
+    sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+    from bib_lookup.utils import (
+        color_text,
+        gather_tex_source_files_in_one,
+        md_text,
+        printmd,
+    )
+
+
+COLORS = [
+    "green",
+    "red",
+    "blue",
+    "purple",
+    "gray",
+    "bold",
+    "underline",
+    "warning",
+]
+METHODS = ["ansi", "html", "file"]
+
+_TEXT = "test"
+
+_ERR_COLOR_TYPE = re.compile(
+    "Cannot color text with provided color of type <class '.+'>"
+)
+_ERR_UNKNOWN_COLOR = re.compile(r"^unknown text color \w+$")
+_ERR_UNKNOWN_METHOD = re.compile(r"^unknown text color method \w+$")
+
+_ENTRY_TEX = r"""\documentclass{article}
+\begin{document}
+\input{sections/intro}
+% \input{sections/unused}
+\end{document}
+"""
+_INTRO_TEX = r"""\section{Introduction}
+\input{sections/background.tex}
+"""
+_BACKGROUND_TEX = r"""\subsection{Background}
+"""
+_GATHERED_TEX = _ENTRY_TEX.replace(
+    "\\input{sections/intro}",
+    _INTRO_TEX.replace("\\input{sections/background.tex}", _BACKGROUND_TEX),
+)
+
+_MD_KWARGS = {
+    "plain": {},
+    "colored": {"color": "green"},
+    "bold": {"bold": True},
+    "font_size": {"font_size": 20},
+    "font_family": {"font_family": "monospace"},
+    "html": {"color": "red", "method": "html", "bold": True},
+}
+
+_ERR_OUTPUT_EXISTS = re.compile("The output file exists")
+_ERR_SAME_FILE = re.compile("The entry file and the output file are the same")
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("color", COLORS)
+def test_color_text(color, method):
+    colored = color_text(_TEXT, color, method=method)
+    assert _TEXT in colored
+    if method == "ansi":
+        assert colored.startswith("\033[") and colored.endswith("\033[0m")
+        assert colored == color_text(_TEXT, color.upper(), method=method)
+    elif method == "html":
+        assert colored == f"<font color = {color}>{_TEXT}</font>"
+    else:
+        assert colored == f"[[{_TEXT}]]"
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_color_text_default_color(method):
+    assert color_text(_TEXT, method=method) == _TEXT
+
+
+def test_color_text_multiple_colors():
+    assert color_text(_TEXT, ("red", "bold")) == color_text(
+        color_text(_TEXT, "bold"), "red"
+    )
+
+
+def test_color_text_invalid_color_type():
+    with pytest.raises(TypeError, match=_ERR_COLOR_TYPE):
+        color_text(_TEXT, 1)
+
+
+def test_color_text_unknown_color():
+    with pytest.raises(ValueError, match=_ERR_UNKNOWN_COLOR):
+        color_text(_TEXT, "xxx")
+
+
+def test_color_text_unknown_method():
+    with pytest.raises(ValueError, match=_ERR_UNKNOWN_METHOD):
+        color_text(_TEXT, "red", method="xxx")
+
+
+@pytest.fixture(scope="module")
+def md_payloads():
+    # md_text is pure, so the payloads are built once and shared by the md tests
+    return {name: md_text(_TEXT, **kwargs) for name, kwargs in _MD_KWARGS.items()}
+
+
+def test_md_text(md_payloads):
+    for md_str in md_payloads.values():
+        assert md_str.startswith("<") and _TEXT in md_str
+    assert md_payloads["plain"] == f"""<span style="; ; ">{_TEXT}</span>"""
+    assert "color: green" in md_payloads["colored"]
+    assert md_payloads["bold"].startswith("<strong>")
+    assert "font-size: 20" in md_payloads["font_size"]
+    assert "font-family: 'monospace'" in md_payloads["font_family"]
+    assert md_payloads["html"].startswith("<strong>")
+    with pytest.raises(AssertionError):
+        md_text(_TEXT, method="ansi")
+
+
+def test_printmd(md_payloads, monkeypatch, capsys):
+    try:
+        import IPython.display
+    except ModuleNotFoundError:
+        # without IPython, printmd falls back to print
+        for md_str in md_payloads.values():
+            printmd(md_str)
+        assert capsys.readouterr().out.splitlines() == list(md_payloads.values())
+        return
+    # record instead of rendering
+    shown = []
+    monkeypatch.setattr(IPython.display, "display", lambda obj: shown.append(obj.data))
+    for md_str in md_payloads.values():
+        printmd(md_str)
+    assert shown == list(md_payloads.values())
+
+
+def _make_tex_project(root: Path) -> Path:
+    (root / "sections").mkdir()
+    (root / "sections" / "intro.tex").write_text(_INTRO_TEX)
+    (root / "sections" / "background.tex").write_text(_BACKGROUND_TEX)
+    entry_file = root / "main.tex"
+    entry_file.write_text(_ENTRY_TEX)
+    return entry_file
+
+
+@pytest.fixture
+def entry_file(tmp_path):
+    return _make_tex_project(tmp_path)
+
+
+def test_gather_returns_text(entry_file):
+    content = gather_tex_source_files_in_one(entry_file)
+    assert content == _GATHERED_TEX
+    assert "\\input{sections/intro}" not in content
+    assert "\\input{sections/background.tex}" not in content
+    # commented out inputs are left as they are
+    assert "% \\input{sections/unused}" in content
+    assert not (entry_file.parent / "main_in_one.tex").exists()
+
+
+def test_gather_writes_default_output(entry_file):
+    default_output_file = entry_file.parent / "main_in_one.tex"
+    assert gather_tex_source_files_in_one(entry_file, write_file=True) == str(
+        default_output_file
+    )
+    assert default_output_file.read_text() == _GATHERED_TEX
+
+
+def test_gather_writes_explicit_output(entry_file, tmp_path):
+    output_file = tmp_path / "gathered.tex"
+    assert gather_tex_source_files_in_one(
+        entry_file, write_file=True, output_file=output_file
+    ) == str(output_file)
+    assert output_file.read_text() == _GATHERED_TEX
+
+
+def test_gather_rejects_existing_output(entry_file, tmp_path):
+    output_file = tmp_path / "gathered.tex"
+    output_file.write_text("existing")
+    with pytest.raises(ValueError, match=_ERR_OUTPUT_EXISTS):
+        gather_tex_source_files_in_one(
+            entry_file, write_file=True, output_file=output_file
+        )
+    assert output_file.read_text() == "existing"
+
+
+def test_gather_rejects_same_path(entry_file):
+    with pytest.raises(ValueError, match=_ERR_SAME_FILE):
+        gather_tex_source_files_in_one(
+            entry_file, write_file=True, output_file=entry_file
+        )
+    assert entry_file.read_text() == _ENTRY_TEX
+
+
+if __name__ == "__main__":
+    for _color in COLORS:
+        for _method in METHODS:
+            test_color_text(_color, _method)
+    for _method in METHODS:
+        test_color_text_default_color(_method)
+    test_color_text_multiple_colors()
+    _md_payloads = {
+        name: md_text(_TEXT, **kwargs) for name, kwargs in _MD_KWARGS.items()
+    }
+    test_md_text(_md_payloads)
+    for _md_str in _md_payloads.values():
+        printmd(_md_str)
+    with tempfile.TemporaryDirectory() as _tmp_dir:
+        _entry_file = _make_tex_project(Path(_tmp_dir))
+        test_gather_returns_text(_entry_file)
+        test_gather_writes_default_output(_entry_file)
+        test_gather_rejects_same_path(_entry_file)